@@ -1,10 +1,24 @@
 import os                                                       # For File Operations
+import asyncio                                                  # For Overlapping File I/O with OCR
 import re                                                       # For Regex
-from pytesseract import image_to_string                         # For OCR
+import subprocess                                               # For Ripgrep
+import threading                                                # For Per-Thread OCR Engines
+import tesserocr                                                # For OCR
 from PIL import Image                                           # For Image Processing
 from tqdm import tqdm                                           # For Progress Bar
-from concurrent.futures import ThreadPoolExecutor, as_completed # For Parallel Processing
+from concurrent.futures import ProcessPoolExecutor              # For Parallel Processing
 import unicodedata                                              # For Unicode Normalization
+import functools                                                # For Caching
+import contextlib                                               # For Suppressing Worker Init Errors
+import hashlib                                                  # For Image Hashing
+import sqlite3                                                  # For the OCR Results Cache
+import io                                                       # For In-Memory Streams
+from ruamel.yaml import YAML                                    # For YAML Front Matter
+from ruamel.yaml.scalarstring import DoubleQuotedScalarString   # For Quoted YAML Values
+try:
+    import re2 as re_fast                                       # For DFA-Based Link Matching (Optional)
+except ImportError:
+    re_fast = re
 
 # VARIABLES / PROPERTIES
 VAULT_PATH = '/Users/paul/Arukas-Pilv/📝 Märkmed/Pauli Obsidiaan/'
@@ -12,7 +26,27 @@ IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.tif')
 ATTACHMENT_FOLDER = '📎 manused'
 OVERWRITE_OCR = False
 OCR_LANGUAGES = 'eng+est'
+MAX_CONCURRENT_FILES = 16
+MIN_IMAGES_FOR_POOL = 4
+MAX_OCR_DIMENSION = 2000
+OCR_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ocr_cache.db')
 
+# PRE-COMPILED REGEXES
+# Extensions already include the dot, so escape it for the regex alternation
+_EXT_PAT = '|'.join(e.replace('.', r'\.') for e in IMAGE_EXTENSIONS)
+# Individual Obsidian-wiki image links, e.g. ![[image.jpg]], matched by RE2's linear-time engine if available
+# (case-insensitivity is set inline, as RE2 does not take `re` flags)
+_IMG_LINK_RE = re_fast.compile(rb'(?i)!\[\[([^]]+?(?:' + _EXT_PAT.encode() + rb'))\]\]')
+# A top-level OCR property in the front matter, including any indented continuation lines
+_OCR_PROPERTY_RE = re.compile(rb'^OCR:.*\n(?:[ \t]+.*\n)*', re.MULTILINE)
+# Runs of whitespace in OCR output, collapsed into a single space
+_WS_RE = re.compile(r'\s+')
+
+# Single-character OCR output clean-up, applied in one pass
+_CLEAN_TABLE = str.maketrans({'\n': ' ', '\r': '', '\t': ' ', '"': "'"})
+
+# Tesseract API handles and OCR cache connections, one per worker thread (loading the language models is expensive)
+_tls = threading.local()
 
 
 def list_markdown_files(path: str) -> list[str]:
@@ -21,6 +55,9 @@ def list_markdown_files(path: str) -> list[str]:
 
     This function traverses the directory specified by `path`, including all its subdirectories,
     and collects the paths of all files that have a '.md' extension, indicating Markdown files.
+    Directories are walked with `os.scandir` using an explicit stack, so the entry types come from
+    the directory listing itself instead of a separate stat call per entry. Directories that cannot
+    be read are skipped.
 
     Parameters:
     - path (str): The root directory path from which to start searching for Markdown files.
@@ -30,24 +67,69 @@ def list_markdown_files(path: str) -> list[str]:
       within the specified directory or its subdirectories.
     """
     markdown_files = []
-    for root, dirs, files in os.walk(path):
-        for file in files:
-            if file.endswith(".md"):
-                markdown_files.append(os.path.join(root, file))
+    directories = [path]
+    while directories:
+        try:
+            entries = os.scandir(directories.pop())
+        except OSError:
+            # Skip unreadable or vanished directories, like os.walk does
+            continue
+        with entries:
+            for entry in entries:
+                # DirEntry caches the file type from the directory read, so no extra stat is needed
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    markdown_files.append(entry.path)
     return markdown_files
 
 
 
+def list_processed_files(path: str) -> set[str]:
+    """
+    List all Markdown files in a given directory that already contain an "OCR:" property.
+
+    This function runs ripgrep (`rg`) over the directory specified by `path` to find every Markdown
+    file with a line starting with "OCR:". Ripgrep searches the files in parallel and with vectorized
+    literal matching, so a vault that was mostly processed before can be filtered in a single call
+    instead of opening and reading every note from Python. By default ripgrep skips hidden files and
+    files ignored by `.gitignore`; such notes are not in the returned set and are therefore still
+    checked by `extract_image_links`.
+
+    Parameters:
+    - path (str): The root directory path from which to start searching for Markdown files.
+
+    Returns:
+    - set[str]: The normalized paths of the Markdown files that already contain OCR text. If ripgrep
+      is not installed or finds nothing, an empty set is returned and every file is checked by
+      `extract_image_links` instead. Matches are kept even if ripgrep could not read some files.
+    """
+    try:
+        result = subprocess.run(['rg', '--files-with-matches', '--null', '--glob', '*.md', '-e', '^OCR:', path], capture_output=True)
+    except FileNotFoundError:
+        return set()
+    # Exit code 1 means no matches; exit code 2 is also used when only some files could not be read,
+    # so any matches printed alongside such errors are still valid
+    if result.returncode == 1 or not result.stdout:
+        return set()
+    return {os.path.normpath(os.fsdecode(file)) for file in result.stdout.split(b'\0') if file}
+
+
+
 def extract_image_links(md_file: str, overwrite: bool) -> list[str]:
     """
     Extract image links from a Markdown file, specifically formatted for Obsidian's wiki link syntax.
 
-    This function opens and reads the content of a Markdown file. It then searches for image links
-    that are formatted using Obsidian's wiki link syntax (e.g., `![[image.jpg]]`). The search is
-    case-insensitive and supports various image file extensions. If the Markdown file contains the
-    marker "OCR:", indicating that an OCR scan has already been processed for this file, and the
-    `overwrite` parameter is False, the function will return an empty list to avoid overwriting
-    existing OCR data.
+    This function opens and reads the content of a Markdown file in binary mode. It then searches
+    for image links that are formatted using Obsidian's wiki link syntax (e.g., `![[image.jpg]]`).
+    The search is case-insensitive and supports various image file extensions. Files without any
+    `![[` embed are skipped before the regex is run. As all markers are ASCII, the search runs on
+    the raw bytes and only the matched links are decoded. If the Markdown file contains the marker
+    "OCR:" at the start of a line, indicating that an OCR scan has already been processed for this
+    file, and the `overwrite` parameter is False, the function will return an empty list to avoid
+    overwriting existing OCR data. The marker is first looked for in the first 4 KB of the file,
+    where the front matter sits, so already processed notes are skipped without reading the rest of
+    the file.
 
     Parameters:
     - md_file (str): The path to the Markdown file from which to extract image links.
@@ -59,21 +141,28 @@ def extract_image_links(md_file: str, overwrite: bool) -> list[str]:
       Markdown file. The paths are extracted based on Obsidian's wiki link syntax for images.
 
     Note:
-    - The function assumes that `IMAGE_EXTENSIONS` is a global variable containing a list of
-      image file extensions to look for within the Markdown content.
+    - The link pattern is pre-compiled at module level as `_IMG_LINK_RE` from the global
+      `IMAGE_EXTENSIONS`, a list of image file extensions to look for within the Markdown content.
+      It uses Google's RE2 engine when the optional `google-re2` package is installed, and Python's
+      `re` module otherwise.
     - The function is designed to work with Obsidian's specific wiki link syntax for embedding
       images and may not correctly identify image links formatted differently.
     """
     image_links = []
-    with open(md_file, 'r') as file:
-        content = file.read()
-        if not overwrite and "OCR:" in content:
+    with open(md_file, 'rb') as file:
+        # The front matter sits at the start of the file, so processed notes are usually recognized from the first page
+        head = file.read(4096)
+        # Only an "OCR:" property at the start of a line counts, not the word within body text
+        if not overwrite and b"\nOCR:" in head:
+            return []
+        content = head + file.read()
+        if not overwrite and b"\nOCR:" in content:
             return []
-        # Adjust the regex pattern to work with extensions that already include the dot
-        extensions_pattern = r"|".join(IMAGE_EXTENSIONS).replace(".", r"\.")
-        # Adjusted pattern to correctly match individual Obsidian-wiki image links
-        pattern = r'!\[\[([^]]+?(?:' + extensions_pattern + r'))\]\]'
-        image_links += re.findall(pattern, content, re.IGNORECASE)
+        # Skip the regex scan entirely for notes without any embeds
+        if b"![[" not in content:
+            return []
+        # All markers are ASCII, so only the matched links have to be decoded
+        image_links += [link.decode('utf-8') for link in _IMG_LINK_RE.findall(content)]
     return image_links
 
 
@@ -98,17 +187,94 @@ def modify_image_path(image_path):
 
 
 
+def _get_api() -> tesserocr.PyTessBaseAPI:
+    """
+    Return the Tesseract API of the current worker thread, creating it on first use.
+
+    The API is set up for the languages in the global `OCR_LANGUAGES` variable, runs the LSTM
+    recognizer only, assumes a single block of text and a resolution of 300 DPI.
+
+    Returns:
+    - tesserocr.PyTessBaseAPI: The Tesseract API, with its language models loaded.
+    """
+    api = getattr(_tls, 'api', None)
+    if api is None:
+        # LSTM engine only, treating each image as a single uniform block of text
+        api = _tls.api = tesserocr.PyTessBaseAPI(lang=OCR_LANGUAGES, psm=tesserocr.PSM.SINGLE_BLOCK, oem=tesserocr.OEM.LSTM_ONLY)
+        api.SetVariable('user_defined_dpi', '300')
+    return api
+
+
+
+def _get_cache() -> sqlite3.Connection | None:
+    """
+    Return the OCR results cache connection of the current worker thread, opening it on first use.
+
+    The cache is a SQLite database at `OCR_CACHE_PATH` that maps the SHA-256 hash of an image's
+    content and the OCR languages to the raw text Tesseract extracted from it. It is opened in WAL
+    mode, so the worker processes can read it concurrently while one of them writes.
+
+    Returns:
+    - sqlite3.Connection | None: The cache connection, with the `ocr` table created if needed, or
+      None if the cache cannot be opened, e.g. because its directory is read-only. The failure is
+      reported once and remembered, so the worker does not try again for every image.
+    """
+    cache = getattr(_tls, 'cache', None)
+    if cache is None and not getattr(_tls, 'cache_disabled', False):
+        try:
+            cache = sqlite3.connect(OCR_CACHE_PATH, timeout=30)
+            cache.execute('PRAGMA journal_mode=WAL')
+            cache.execute('CREATE TABLE IF NOT EXISTS ocr (hash BLOB, lang TEXT, text TEXT, PRIMARY KEY (hash, lang))')
+        except sqlite3.Error as e:
+            # The cache is only an optimization, so carry on without it
+            print(f"OCR cache unavailable, processing images uncached: {e}")
+            if cache is not None:
+                cache.close()
+            _tls.cache_disabled = True
+            return None
+        _tls.cache = cache
+    return cache
+
+
+
+def _worker_init() -> None:
+    """
+    Initialize an OCR worker process, used as the `initializer` of the OCR ProcessPoolExecutor.
+
+    Loads the Tesseract language models and opens the OCR results cache as soon as the worker process
+    starts, so this cost is paid while the pool spins up rather than on the worker's first image.
+    Tesseract errors are swallowed here, as an exception in an initializer breaks the whole pool;
+    `perform_ocr` tries again on every image and reports the error through its usual error handling.
+    `_get_cache` reports and remembers its own failures, so an unusable cache is reported only once.
+    """
+    with contextlib.suppress(Exception):
+        _get_api()
+    _get_cache()
+
+
+
 def perform_ocr(image_path: str) -> str:
     """
     Perform OCR (Optical Character Recognition) on an image file.
 
-    This function uses the `image_to_string` method from the Tesseract OCR engine to extract text
-    from an image specified by `image_path`. The OCR process is configured to recognize languages
-    specified in the global `OCR_LANGUAGES` variable. After extracting the text, the function
-    performs a series of string replacements to clean up the OCR result: it strips leading and
-    trailing spaces, replaces newline characters and carriage returns with a space, replaces tabs
-    with a space, collapses multiple spaces into a single space, replaces double quotes with single
-    quotes, and escapes backslashes.
+    This function uses a persistent `tesserocr.PyTessBaseAPI` instance to extract text from an image
+    specified by `image_path`. The API is created once per worker thread with the languages
+    specified in the global `OCR_LANGUAGES` variable and reused for every subsequent image, so the
+    Tesseract language models are only loaded once instead of once per image (see `_get_api`; in the
+    worker processes of `main` this happens at start-up in `_worker_init`). Before running the
+    engine, the image's SHA-256 hash is looked up in the OCR results cache (see `_get_cache`), and
+    images that were recognized before with the same languages are not processed again; if the cache
+    cannot be used, the image is simply processed uncached. The engine runs the LSTM recognizer
+    only, assumes a single block of text and a resolution of 300 DPI. Before recognition,
+    transparent images are flattened onto a white background and the image is converted to grayscale
+    and down-sampled so that neither side exceeds the global `MAX_OCR_DIMENSION`, since Tesseract's
+    runtime grows with the pixel count. JPEG images are put in draft mode first, so libjpeg decodes
+    them directly to grayscale and at a reduced scale. The image file is read only once, for both
+    hashing and decoding. After extracting the text, the function cleans up the OCR result: a single
+    `str.translate` pass replaces newline characters and tabs with a space, drops carriage returns
+    and replaces double quotes with single quotes. The result is stripped of leading and trailing
+    spaces and every run of whitespace is collapsed into a single space. Escaping for YAML is left
+    to `update_markdown_file`.
 
     Parameters:
     - image_path (str): The file path of the image to be processed with OCR.
@@ -118,20 +284,54 @@ def perform_ocr(image_path: str) -> str:
       process, the function prints an error message and returns None.
 
     Note:
-    - The OCR process is dependent on the Tesseract OCR engine, which must be correctly installed
-      and configured in the environment where this function is executed.
+    - The OCR process is dependent on the Tesseract OCR engine and the `tesserocr` bindings, which
+      must be correctly installed and configured in the environment where this function is executed.
     - The `OCR_LANGUAGES` variable should contain the languages to be recognized by the OCR,
       formatted as a string compatible with Tesseract's language options.
     """
     try:
-        ocr_text = image_to_string(Image.open(image_path), lang=OCR_LANGUAGES)
-        return ocr_text.strip().replace('\n', ' ').replace('\r', '').replace('\t', ' ').replace('  ', ' ').replace(r'"', r"'").replace('\\', '\\\\')
-    except Exception as e:
-        if "No such file or directory" in str(e) and ".resources" in image_path:
-            return perform_ocr(modify_image_path(image_path))
+        # Identical images are only recognized once, across all notes and runs
+        with open(image_path, 'rb') as file:
+            image_bytes = file.read()
+        image_hash = hashlib.sha256(image_bytes).digest()
+        cache, cached = _get_cache(), None
+        if cache is not None:
+            try:
+                cached = cache.execute('SELECT text FROM ocr WHERE hash = ? AND lang = ?', (image_hash, OCR_LANGUAGES)).fetchone()
+            except sqlite3.Error as e:
+                # The cache is only an optimization, so fall back to running the OCR uncached
+                print(f"Error reading cached OCR text of {image_path}: {e}")
+        if cached is not None:
+            ocr_text = cached[0]
         else:
-            print(f"Error processing {image_path}: {e}")
-            return None
+            api = _get_api()
+            # Grayscale and down-sampled images are recognized just as well, at a fraction of the cost
+            image = Image.open(io.BytesIO(image_bytes))
+            if image.format == 'JPEG':
+                # Let libjpeg decode straight to grayscale, at a reduced scale for large images
+                scale = min(1, MAX_OCR_DIMENSION / max(image.size))
+                image.draft('L', (int(image.width * scale), int(image.height * scale)))
+            if 'A' in image.getbands() or 'transparency' in image.info:
+                # Flatten transparent images onto white, dropping the alpha channel alone would leave them black
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, 'white')
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            image = image.convert('L')
+            if max(image.size) > MAX_OCR_DIMENSION:
+                image.thumbnail((MAX_OCR_DIMENSION, MAX_OCR_DIMENSION), Image.LANCZOS)
+            api.SetImage(image)
+            ocr_text = api.GetUTF8Text()
+            if cache is not None:
+                try:
+                    with cache:
+                        cache.execute('INSERT OR REPLACE INTO ocr VALUES (?, ?, ?)', (image_hash, OCR_LANGUAGES, ocr_text))
+                except sqlite3.Error as e:
+                    print(f"Error caching OCR text of {image_path}: {e}")
+        return _WS_RE.sub(' ', ocr_text.translate(_CLEAN_TABLE).strip())
+    except Exception as e:
+        print(f"Error processing {image_path}: {e}")
+        return None
 
 
 
@@ -139,14 +339,17 @@ def update_markdown_file(md_file: str, ocr_text: str) -> None:
     """
     Update a Markdown file with OCR text as a property in its YAML front matter.
 
-    This function reads the content of a specified Markdown file and checks for the presence of
-    YAML front matter at the beginning of the file. If YAML front matter exists and already contains
-    an "OCR:" property, the function can overwrite it. If the "OCR:" property does
-    not exist, it is added with `ocr_text` as its value. If the file does not have YAML front matter,
-    the function prepends it with an "OCR:" property containing `ocr_text`.
+    This function reads the content of a specified Markdown file in binary mode and checks for the
+    presence of YAML front matter at the beginning of the file. The "OCR" property is serialized on
+    its own with `ruamel.yaml`, as a double-quoted string, so `ocr_text` is always escaped correctly.
+    That line then replaces any existing top-level "OCR:" property, including its indented
+    continuation lines, or is appended to the end of the front matter. The rest of the front matter
+    is not parsed or re-dumped, so other properties stay byte-for-byte as they were, including their
+    formatting, comments and quoting. If the file does not have YAML front matter, the function
+    prepends one containing only the "OCR" property. The body is never decoded.
 
     The updated content, including the modified or added YAML front matter, is then written back to
-    the file.
+    the file. Only the part from the first change onwards is rewritten, see `_write_changes`.
 
     Parameters:
     - md_file (str): The path to the Markdown file to be updated.
@@ -156,39 +359,86 @@ def update_markdown_file(md_file: str, ocr_text: str) -> None:
     - This function directly modifies the content of the file specified by `md_file`.
     - The OCR text is added to or replaces the "OCR:" property within the YAML front matter.
     """
-    # Read the existing content of the file
-    with open(md_file, 'r') as file:
-        existing_content = file.read()
+    # Read the existing content of the file, the body is never decoded
+    with open(md_file, 'rb') as file:
+        raw_content = file.read()
+    existing_content = raw_content.replace(b'\r\n', b'\n')
     
-    # Check if there's an existing YAML front matter (LLM Generated Regex)
-    front_matter_match = re.search(r'^---\n(.*?)\n---', existing_content, re.DOTALL)
+    # Check if there's an existing YAML front matter, delimited by '---' lines
+    front_matter_end = existing_content.find(b'\n---', 3) if existing_content.startswith(b'---\n') else -1
+    if front_matter_end != -1:
+        front_matter = existing_content[4:front_matter_end + 1]
+        body = existing_content[front_matter_end + 1:]
+    else:
+        # If no YAML front matter, prepend one
+        front_matter = b''
+        body = b'---\n' + existing_content
     
-    if front_matter_match:
-        # Extract existing front matter
-        front_matter = front_matter_match.group(1)
-        
-        # Check if OCR property exists
-        if 'OCR:' in front_matter:
-            # Replace existing OCR property with updated value (LLM Generated Regex)
-            updated_front_matter = re.sub(
-                r'(OCR:\s*").*(")',
-                lambda match: match.group(1) + ocr_text + match.group(2),
-                front_matter
-            )
-        else:
-            # Append the OCR property, enclosing ocr_text in quotation marks
-            updated_front_matter = front_matter + f'\nOCR: "{ocr_text}"'
-        
-        # Use the escaped string in re.sub (LLM Generated Regex)
-        updated_content = re.sub(r'^---\n(.*?)\n---', '---\n' + updated_front_matter + '\n---', existing_content, 1, re.DOTALL)
+    # Serialize only the OCR property, enclosing ocr_text in quotation marks
+    yaml = YAML()
+    yaml.width = float('inf')
+    buffer = io.StringIO()
+    yaml.dump({'OCR': DoubleQuotedScalarString(ocr_text)}, buffer)
+    ocr_property = buffer.getvalue().encode('utf-8')
+    
+    # Splice it in place of an existing OCR property, or append it, leaving other properties untouched
+    existing_property = _OCR_PROPERTY_RE.search(front_matter)
+    if existing_property:
+        updated_front_matter = front_matter[:existing_property.start()] + ocr_property + front_matter[existing_property.end():]
     else:
-        # If no YAML front matter, prepend one with the OCR property, enclosing ocr_text in quotation marks
-        ocr_block = f"---\nOCR: \"{ocr_text}\"\n---\n"
-        updated_content = ocr_block + existing_content
+        updated_front_matter = front_matter + ocr_property
     
-    # Write the updated content back to the file
-    with open(md_file, 'w') as file:
-        file.write(updated_content)
+    updated_content = b'---\n' + updated_front_matter + body
+    if front_matter_end != -1 and len(existing_content) == len(raw_content):
+        changes_start = 4 + len(os.path.commonprefix([front_matter, updated_front_matter]))
+    else:
+        # A new front matter block or normalized line endings change the file from its start
+        changes_start = 0
+    changes_end = 4 + len(updated_front_matter)
+    
+    # Write the updated part of the content back to the file
+    _write_changes(md_file, raw_content, updated_content, changes_start, changes_end)
+
+
+
+def _write_changes(md_file: str, raw_content: bytes, updated_content: bytes, changes_start: int, changes_end: int) -> None:
+    """
+    Write only the changed part of a Markdown file back to disk.
+
+    Everything in `updated_content` before `changes_start` is identical to the file on disk, so the
+    file is opened in place and only the bytes from that offset onwards are written. If the file keeps
+    its size, the body after `changes_end` has not moved either and only the changed span is
+    overwritten, otherwise the remainder is rewritten and the file truncated to its new length.
+
+    Parameters:
+    - md_file (str): The path to the Markdown file to be written.
+    - raw_content (bytes): The current content of the file on disk.
+    - updated_content (bytes): The full updated content of the file.
+    - changes_start (int): The byte offset of the first change in `updated_content`.
+    - changes_end (int): The byte offset after which `updated_content` matches the original body.
+    """
+    with open(md_file, 'r+b') as file:
+        file.seek(changes_start)
+        if len(updated_content) == len(raw_content) and changes_start:
+            file.write(updated_content[changes_start:changes_end])
+        else:
+            file.write(updated_content[changes_start:])
+            file.truncate()
+
+
+
+@functools.lru_cache(maxsize=4096)
+def _nfd_parts(path: str) -> frozenset[str]:
+    """
+    Return the NFD-normalized directory parts of a path, cached per path.
+
+    Parameters:
+    - path (str): A '/'-separated file path.
+
+    Returns:
+    - frozenset[str]: The set of the path's parts in Unicode NFD form.
+    """
+    return frozenset(unicodedata.normalize('NFD', part) for part in path.split('/'))
 
 
 
@@ -203,7 +453,8 @@ def find_linked_attachment(md_path: str, image_link: str) -> str:
     (with spaces replaced by underscores) and appended with ".resources", located within a global
     attachment folder. If the image link contains the attachment folder's name, the function
     constructs the path by excluding any overlapping parts of the path in the image link and the
-    Markdown document's path.
+    Markdown document's path. The normalized parts of the Markdown document's path are cached, so
+    they are computed once per document rather than once per linked image.
 
     Parameters:
     - md_path (str): The file path of the Markdown document.
@@ -221,58 +472,176 @@ def find_linked_attachment(md_path: str, image_link: str) -> str:
     if ATTACHMENT_FOLDER not in image_link:
         return os.path.dirname(md_path)+"/"+ATTACHMENT_FOLDER+"/"+str(os.path.splitext(os.path.basename(md_path))[0]).replace(" ","_")+".resources/"+os.path.basename(image_link)
     else:
-        return os.path.dirname(md_path)+'/'+'/'.join([i for i in image_link.split('/') if unicodedata.normalize('NFD', i) not in [unicodedata.normalize('NFD', part) for part in md_path.split('/')]])
+        md_parts = _nfd_parts(md_path)
+        return os.path.dirname(md_path)+'/'+'/'.join(i for i in image_link.split('/') if unicodedata.normalize('NFD', i) not in md_parts)
+
 
 
+def find_image_paths(md_file: str) -> list[str]:
+    """
+    Resolve the file paths of all images linked in a Markdown file.
+
+    This function extracts the image links of a Markdown file with `extract_image_links` and turns
+    each of them into a file path with `find_linked_attachment`. Paths are validated up front: if an
+    image does not exist at its expected location and the path contains a '.resources' folder, the
+    path is resolved with `modify_image_path` instead. A single stat call per image replaces opening
+    the missing image and recovering from the resulting exception during OCR.
+
+    Parameters:
+    - md_file (str): The path to the Markdown file whose images should be resolved.
 
-def process_markdown_file(md_file: str) -> None:
+    Returns:
+    - list[str]: The file paths of the linked images, in the order they are linked.
     """
-    Process a Markdown file to extract text from linked images using OCR and update the file.
+    image_paths = []
+    for link in extract_image_links(md_file, OVERWRITE_OCR):
+        image_path = find_linked_attachment(md_file, link)
+        if not os.path.exists(image_path) and ".resources" in image_path:
+            image_path = modify_image_path(image_path)
+        image_paths.append(image_path)
+    return image_paths
+
+
 
-    This function takes a path to a Markdown file, extracts all image links from it, and uses Optical
-    Character Recognition (OCR) to extract text from these images. The OCR results are then aggregated
-    and used to update the Markdown file.
+async def ocr_image(image_path: str, ocr_pool: ProcessPoolExecutor | None, ocr_slots: asyncio.Semaphore) -> str:
+    """
+    Run `perform_ocr` for a single image on the OCR pool, once a slot is free.
 
-    The function operates concurrently, processing up to five images in parallel to improve performance.
-    After extracting text from all linked images, it aggregates the results into a single string. If any
-    text was successfully extracted from the images, the Markdown file is updated with this text.
+    Only as many images as `ocr_slots` allows are submitted to the pool at any time. The remaining
+    images wait here without being handed to a worker, which forms a sliding window over all images
+    of the vault and caps the number of images decoded in memory at once. Without a pool, for runs too
+    small to be worth starting worker processes, `perform_ocr` runs on a thread instead, which keeps
+    the event loop free for scanning and writing files.
+
+    Parameters:
+    - image_path (str): The file path of the image to be processed with OCR.
+    - ocr_pool (ProcessPoolExecutor | None): The global executor running `perform_ocr`, or None to
+      run it on a thread.
+    - ocr_slots (asyncio.Semaphore): Caps the number of images submitted to `ocr_pool` at once.
+
+    Returns:
+    - str: The OCR-extracted text as returned by `perform_ocr`.
+    """
+    if ocr_pool is None:
+        return await asyncio.to_thread(perform_ocr, image_path)
+    async with ocr_slots:
+        return await asyncio.get_running_loop().run_in_executor(ocr_pool, perform_ocr, image_path)
+
+
+
+async def scan_markdown_files(markdown_files: list[str], queue: asyncio.Queue, progress: tqdm, consumers: int, ocr_pool: asyncio.Future, workers: int) -> None:
+    """
+    Resolve the linked images of all Markdown files and stream them to the OCR consumers.
+
+    This coroutine is the producer side of the pipeline. It walks through `markdown_files`, resolves
+    the images linked in each of them with `find_image_paths` on a worker thread, and puts every
+    file that links at least one image on `queue` as a `(md_file, image_paths)` tuple. Reading the
+    Markdown files thus overlaps with the OCR of files scanned earlier, instead of delaying the
+    first OCR task until the whole vault is scanned. Since `queue` is bounded, scanning pauses when
+    it gets too far ahead of the OCR.
+
+    The producer also decides whether the OCR runs on worker processes. Once `MIN_IMAGES_FOR_POOL`
+    linked images have been found, it starts the ProcessPoolExecutor and resolves `ocr_pool` with
+    it. If the whole scan finds fewer images, starting the worker processes would cost more than it
+    saves, so `ocr_pool` is resolved with None and the OCR runs on threads instead.
+
+    Parameters:
+    - markdown_files (list[str]): The paths of the Markdown files to be scanned.
+    - queue (asyncio.Queue): The queue the consumers take the Markdown files to process from.
+    - progress (tqdm): The progress bar, advanced for files without any linked images.
+    - consumers (int): The number of consumers, each of which is sent a `None` sentinel at the end.
+    - ocr_pool (asyncio.Future): Resolved with the OCR executor, or None if no pool is needed.
+    - workers (int): The number of worker processes of the OCR executor.
+    """
+    image_count = 0
+    for md_file in markdown_files:
+        image_paths = await asyncio.to_thread(find_image_paths, md_file)
+        image_count += len(image_paths)
+        if not ocr_pool.done() and image_count >= MIN_IMAGES_FOR_POOL:
+            ocr_pool.set_result(ProcessPoolExecutor(max_workers=workers, initializer=_worker_init))
+        if image_paths:
+            await queue.put((md_file, image_paths))
+        else:
+            progress.update()
+    if not ocr_pool.done():
+        # Too few images for the worker processes to pay off
+        ocr_pool.set_result(None)
+    for _ in range(consumers):
+        await queue.put(None)
+
+
+
+async def process_markdown_file(md_file: str, image_paths: list[str], ocr_pool: ProcessPoolExecutor | None, ocr_slots: asyncio.Semaphore) -> None:
+    """
+    Extract text from the images linked in a Markdown file using OCR and update the file.
+
+    This coroutine uses Optical Character Recognition (OCR) to extract text from the images linked
+    in a Markdown file. The OCR results are then aggregated and used to update the Markdown file.
+
+    The OCR of every linked image is submitted to the shared `ocr_pool` through `ocr_image` and
+    awaited together, while writing the Markdown file is offloaded to a thread with
+    `asyncio.to_thread`. While one file waits on the disk, the OCR workers keep processing images
+    from other files, so file I/O overlaps with OCR instead of stalling it.
 
     Parameters:
     - md_file (str): The path to the Markdown file to be processed.
+    - image_paths (list[str]): The file paths of the images linked in the Markdown file.
+    - ocr_pool (ProcessPoolExecutor | None): The global executor running `perform_ocr`, or None to
+      run it on a thread.
+    - ocr_slots (asyncio.Semaphore): Caps the number of images submitted to `ocr_pool` at once.
 
     Note:
-    - The function relies on `extract_image_links` to find image links within the Markdown file.
-    - `perform_ocr` is used to extract text from the images linked in the Markdown file.
-    - `find_linked_attachment` constructs the path to the image file based on its link in the Markdown.
+    - `ocr_image` is used to extract text from the images linked in the Markdown file.
     - `update_markdown_file` is used to update the Markdown file with the extracted text.
-    - The function uses a ThreadPoolExecutor to process up to five images in parallel.
-    """
-    image_links = extract_image_links(md_file, OVERWRITE_OCR)
-    ocr_texts = []
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        # Create a future for each image processing task
-        future_to_image = {executor.submit(perform_ocr, find_linked_attachment(md_file, link)): link for link in image_links}
-        for future in as_completed(future_to_image):
-            ocr_texts.append(future.result())
+    """
+    # Results are returned in link order
+    ocr_texts = await asyncio.gather(*(ocr_image(image_path, ocr_pool, ocr_slots) for image_path in image_paths))
     # Aggregate OCR text results
     ocr_text = "".join(str(text) if text is not None else '' for text in ocr_texts)
     if ocr_text:
-        update_markdown_file(md_file, ocr_text)
+        await asyncio.to_thread(update_markdown_file, md_file, ocr_text)
 
 
 
-def main():
+async def consume_markdown_files(queue: asyncio.Queue, ocr_pool: asyncio.Future, ocr_slots: asyncio.Semaphore, progress: tqdm) -> None:
     """
-    Main function to process all Markdown files in a specified vault path for OCR.
+    Process the Markdown files put on the queue by `scan_markdown_files`, until a `None` sentinel.
+
+    Parameters:
+    - queue (asyncio.Queue): The queue of `(md_file, image_paths)` tuples to be processed.
+    - ocr_pool (asyncio.Future): Resolved by `scan_markdown_files` with the OCR executor, or None to
+      run the OCR on threads. Files are only processed once it is resolved.
+    - ocr_slots (asyncio.Semaphore): Caps the number of images submitted to the executor at once.
+    - progress (tqdm): The progress bar, advanced for every processed file.
+    """
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        md_file, image_paths = item
+        await process_markdown_file(md_file, image_paths, await ocr_pool, ocr_slots)
+        progress.update()
 
-    This function finds all Markdown files within a predefined vault path and processes each file
-    concurrently using a ThreadPoolExecutor. The processing involves extracting text from images
-    linked in the Markdown files using Optical Character Recognition (OCR) and updating the files
-    with the extracted text.
 
-    The function utilizes a ThreadPoolExecutor to manage a pool of worker threads, allowing up to
-    five Markdown files to be processed in parallel. This parallel processing is aimed at improving
-    the efficiency and speed of the OCR operation across multiple files.
+
+async def main():
+    """
+    Main function to process all Markdown files in a specified vault path for OCR.
+
+    This function finds all Markdown files within a predefined vault path, drops the ones that
+    already contain OCR text unless `OVERWRITE_OCR` is set, and processes the rest concurrently on
+    an asyncio event loop. A single producer, `scan_markdown_files`, resolves the images linked in
+    each file and streams them through a bounded queue to `MAX_CONCURRENT_FILES` consumers, which run
+    the OCR and update the files. All OCR work is submitted to one global ProcessPoolExecutor with
+    one worker process per CPU core. OCR is CPU-bound, so separate processes sidestep the GIL and let
+    every core run Tesseract at once, while the event loop overlaps the reading and writing of
+    Markdown files with the running OCR. Each worker process loads its Tesseract language models in
+    `_worker_init` when it starts, rather than on its first image.
+
+    A semaphore limits the images submitted to the pool to one per worker, so pending images are
+    not queued up inside the executor. The pool is only started once `scan_markdown_files` has found
+    `MIN_IMAGES_FOR_POOL` linked images; for fewer images, starting the worker processes would cost
+    more than it saves, so no pool is created and the OCR runs on threads.
 
     The progress of the file processing is displayed in real-time using tqdm, providing a visual
     progress bar in the console. This feedback is valuable for understanding the progress of the
@@ -281,13 +650,27 @@ def main():
     Note:
     - VAULT_PATH is a global variable that specifies the path to the vault (directory) containing
       the Markdown files to be processed.
-    - process_markdown_file is the function called by each worker thread to process a single Markdown
-      file. It is responsible for extracting text from images within the file and updating the file
-      accordingly.
+    - process_markdown_file is the coroutine that processes a single Markdown file. It is responsible
+      for extracting text from images within the file and updating the file accordingly.
     """
     markdown_files = list_markdown_files(VAULT_PATH)
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        # Submit all markdown files for processing
-        list(tqdm(executor.map(process_markdown_file, markdown_files), total=len(markdown_files), desc="Processing Markdown Files", unit="md"))
+    if not OVERWRITE_OCR:
+        # Drop already processed notes up front instead of reading each of them just to skip it
+        processed_files = list_processed_files(VAULT_PATH)
+        markdown_files = [md_file for md_file in markdown_files if os.path.normpath(md_file) not in processed_files]
+    workers = os.cpu_count() or 1
+    queue = asyncio.Queue(maxsize=256)
+    ocr_slots = asyncio.Semaphore(workers)
+    # Resolved by the producer once it knows whether there are enough images for a pool
+    ocr_pool = asyncio.get_running_loop().create_future()
+    try:
+        with tqdm(total=len(markdown_files), desc="Processing Markdown Files", unit="md") as progress:
+            await asyncio.gather(
+                scan_markdown_files(markdown_files, queue, progress, MAX_CONCURRENT_FILES, ocr_pool, workers),
+                *(consume_markdown_files(queue, ocr_pool, ocr_slots, progress) for _ in range(MAX_CONCURRENT_FILES))
+            )
+    finally:
+        if ocr_pool.done() and ocr_pool.result() is not None:
+            ocr_pool.result().shutdown()
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())